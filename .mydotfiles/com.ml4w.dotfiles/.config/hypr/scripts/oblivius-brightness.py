@@ -8,80 +8,398 @@ import gi
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 from gi.repository import Gtk, Adw, Gdk, GLib, Gio
+import ctypes
+import ctypes.util
 import subprocess
+import hashlib
 import json
+import os
+import queue
+import re
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from glob import glob
 from pathlib import Path
-from threading import Thread
+from threading import Lock, Thread
+
+# orjson is optional; both paths read and write bytes
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj).encode()
+    json_loads = json.loads
 
 APP_ID = "com.oblivius.brightness"
 CACHE_FILE = Path("/tmp/oblivius-brightness-displays.json")
-CACHE_AGE = 300  # 5 minutes
+CACHE_AGE = 86400  # 24 hours, hotplug is caught by the connector fingerprint
+# ddcutil sleep multiplier; raise it (e.g. OBLIVIUS_DDC_SLEEP=1.0) for flaky monitors
+DDC_SLEEP = float(os.environ.get("OBLIVIUS_DDC_SLEEP", "0.1"))
+
+BUS_RE = re.compile(r'I2C bus:\s*/dev/i2c-(\d+)')
+MODEL_RE = re.compile(r'Model:[ \t]*(.*)')
+MAX_RE = re.compile(r'max value =\s*(\d+)')
+CURRENT_RE = re.compile(r'current value =\s*(\d+)')
+
+VCP_BRIGHTNESS = 0x10
+
+
+class VcpValue(ctypes.Structure):
+    """DDCA_Non_Table_Vcp_Value"""
+    _fields_ = [("mh", ctypes.c_uint8), ("ml", ctypes.c_uint8),
+                ("sh", ctypes.c_uint8), ("sl", ctypes.c_uint8)]
+
+
+def load_libddcutil():
+    """Load libddcutil, or None to fall back to the ddcutil CLI"""
+    # Missing symbols (ABI drift between ddcutil versions) fall back to the CLI too
+    try:
+        lib = ctypes.CDLL(ctypes.util.find_library("ddcutil") or "libddcutil.so")
+
+        # ddcutil 2.x renamed ddca_create_display_ref, and its refs are persistent (nothing to free)
+        lib.get_display_ref = getattr(lib, "ddca_get_display_ref", None) or lib.ddca_create_display_ref
+        lib.free_display_ref = getattr(lib, "ddca_free_display_ref", None)
+        lib.ddca_create_busno_display_identifier.argtypes = [ctypes.c_int, ctypes.POINTER(ctypes.c_void_p)]
+        lib.ddca_free_display_identifier.argtypes = [ctypes.c_void_p]
+        lib.get_display_ref.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_void_p)]
+        if lib.free_display_ref:
+            lib.free_display_ref.argtypes = [ctypes.c_void_p]
+        lib.ddca_open_display2.argtypes = [ctypes.c_void_p, ctypes.c_bool, ctypes.POINTER(ctypes.c_void_p)]
+        lib.ddca_close_display.argtypes = [ctypes.c_void_p]
+        lib.ddca_get_non_table_vcp_value.argtypes = [ctypes.c_void_p, ctypes.c_uint8, ctypes.POINTER(VcpValue)]
+        lib.ddca_set_non_table_vcp_value.argtypes = [ctypes.c_void_p, ctypes.c_uint8, ctypes.c_uint8, ctypes.c_uint8]
+        if hasattr(lib, "ddca_set_sleep_multiplier"):
+            lib.ddca_set_sleep_multiplier.argtypes = [ctypes.c_double]
+            lib.ddca_set_sleep_multiplier(DDC_SLEEP)
+    except (OSError, AttributeError):
+        return None
+    return lib
+
+
+LIBDDC = load_libddcutil()
+# bus -> (DDCA_Display_Handle, DDCA_Display_Ref, Lock) or None, opened in the background
+# once the window is up and kept open for the app lifetime
+_handles = {}
+_handles_lock = Lock()
+_handles_closed = False
+_cache_lock = Lock()
+
+
+def open_handle(bus):
+    """Open a libddcutil display handle for a bus, or None"""
+    did, dref, handle = ctypes.c_void_p(), ctypes.c_void_p(), ctypes.c_void_p()
+    if LIBDDC.ddca_create_busno_display_identifier(int(bus), ctypes.byref(did)) != 0:
+        return None
+    try:
+        if LIBDDC.get_display_ref(did, ctypes.byref(dref)) != 0:
+            return None
+    finally:
+        LIBDDC.ddca_free_display_identifier(did)
+    if LIBDDC.ddca_open_display2(dref, False, ctypes.byref(handle)) != 0:
+        free_display_ref(dref)
+        return None
+    return handle, dref, Lock()
+
+
+def free_display_ref(dref):
+    """Free a display ref from ddca_create_display_ref (a no-op for 2.x persistent refs)"""
+    if LIBDDC.free_display_ref:
+        LIBDDC.free_display_ref(dref)
+
+
+def close_handle(entry):
+    """Close a display handle and free its ref"""
+    if entry is None:
+        return
+    handle, dref, lock = entry
+    with lock:
+        LIBDDC.ddca_close_display(handle)
+    free_display_ref(dref)
+
+
+def open_handles(buses):
+    """Open handles for buses (background thread, the first open runs libddcutil's own detect)"""
+    if LIBDDC is None:
+        return
+    for bus in buses:
+        if bus in _handles:
+            continue
+        entry = open_handle(bus)
+        with _handles_lock:
+            if _handles_closed:
+                close_handle(entry)
+                return
+            _handles[bus] = entry
+
+
+def close_handles():
+    """Close all display handles (app shutdown, after queued writes landed)"""
+    global _handles_closed
+    with _handles_lock:
+        _handles_closed = True
+        for entry in _handles.values():
+            close_handle(entry)
+        _handles.clear()
+
+
+def get_handle(bus):
+    """Get an open libddcutil display handle for a bus, or None (CLI) until it's opened"""
+    return _handles.get(bus)
+
+
+def lib_getvcp(bus):
+    """Read (current, max) brightness through libddcutil, or None"""
+    entry = get_handle(bus)
+    if entry is None:
+        return None
+    handle, _, lock = entry
+    val = VcpValue()
+    with lock:
+        if LIBDDC.ddca_get_non_table_vcp_value(handle, VCP_BRIGHTNESS, ctypes.byref(val)) != 0:
+            return None
+    return (val.sh << 8) | val.sl, (val.mh << 8) | val.ml
+
+
+def lib_setvcp(bus, value):
+    """Write raw brightness through libddcutil, returns success"""
+    entry = get_handle(bus)
+    if entry is None:
+        return False
+    handle, _, lock = entry
+    with lock:
+        return LIBDDC.ddca_set_non_table_vcp_value(handle, VCP_BRIGHTNESS, value >> 8, value & 0xFF) == 0
+
+
+def ddc_cmd(bus, *args):
+    """Build ddcutil argv for a single bus"""
+    return ["ddcutil", "--bus", str(bus), "--sleep-multiplier", str(DDC_SLEEP),
+            "--skip-ddc-checks", *args]
 
 
 def run_cmd(cmd, timeout=2):
-    """Run command and return output"""
+    """Run command (argv list) and return output"""
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=timeout)
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
         return result.stdout.strip()
     except:
         return ""
 
 
+def display_fingerprint():
+    """Hash DRM connector states so the cache is dropped on hotplug"""
+    paths = sorted(glob("/sys/class/drm/card*-*/status"))
+    return hashlib.blake2b(b"".join(Path(p).read_bytes() for p in paths)).hexdigest()
+
+
+def read_cache():
+    """Read the display cache if fresh, using one fd for both mtime and content"""
+    try:
+        fd = os.open(CACHE_FILE, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        st = os.fstat(fd)
+        if time.time() - st.st_mtime < CACHE_AGE:
+            return json_loads(os.read(fd, st.st_size))
+    except:
+        pass
+    finally:
+        os.close(fd)
+    return None
+
+
+def write_cache(cache):
+    """Publish the cache atomically so readers never see a partial file"""
+    tmp = CACHE_FILE.with_name(f"{CACHE_FILE.name}.{os.getpid()}.tmp")  # per-process, instances may race
+    tmp.write_bytes(json_dumps(cache))
+    os.replace(tmp, CACHE_FILE)
+
+
+def cached_displays(fingerprint):
+    """Displays from the cache if it was written for the connected outputs, else None"""
+    cache = read_cache()
+    if cache and cache.get('fp') == fingerprint:
+        return cache['displays']
+    return None
+
+
 def detect_displays():
     """Detect DDC displays and cache results"""
-    if CACHE_FILE.exists():
-        age = time.time() - CACHE_FILE.stat().st_mtime
-        if age < CACHE_AGE:
-            try:
-                return json.loads(CACHE_FILE.read_text())
-            except:
-                pass
+    fingerprint = display_fingerprint()
+    displays = cached_displays(fingerprint)
+    if displays is not None:
+        return displays
 
-    output = run_cmd("ddcutil detect", timeout=10)
+    output = run_cmd(["ddcutil", "--sleep-multiplier", str(DDC_SLEEP),
+                      "--disable-dynamic-sleep", "detect"], timeout=10)
     displays = []
-    current_bus = None
-
-    for line in output.split('\n'):
-        if 'I2C bus:' in line and 'i2c-' in line:
-            current_bus = line.split('i2c-')[-1].split()[0]
-        elif 'Model:' in line and current_bus:
-            model = line.split('Model:')[-1].strip()
-            max_out = run_cmd(f"ddcutil --bus {current_bus} getvcp 10", timeout=3)
-            max_val = 100
-            if 'max value' in max_out:
-                try:
-                    max_val = int(max_out.split('max value =')[-1].split(',')[0].strip())
-                except:
-                    pass
+    buses = list(BUS_RE.finditer(output))
+
+    # Each display block runs from its bus line to the next one
+    for i, bus_match in enumerate(buses):
+        end = buses[i + 1].start() if i + 1 < len(buses) else len(output)
+        model_match = MODEL_RE.search(output, bus_match.end(), end)
+        if model_match:
+            # Assume the usual MCCS max of 100, the first brightness read records the real one
             displays.append({
-                'bus': current_bus,
-                'model': model,
-                'max': max_val
+                'bus': bus_match.group(1),
+                'model': model_match.group(1).strip(),
+                'max': 100
             })
-            current_bus = None
 
-    CACHE_FILE.write_text(json.dumps(displays))
+    with _cache_lock:
+        write_cache({'fp': fingerprint, 'displays': displays})
     return displays
 
 
-def get_brightness(bus, max_val):
-    """Get current brightness as percentage"""
-    output = run_cmd(f"ddcutil --bus {bus} getvcp 10", timeout=3)
-    if 'current value' in output:
+def update_cached_display(bus, key, value):
+    """Update one field of a cached display entry"""
+    with _cache_lock:
         try:
-            current = int(output.split('current value =')[-1].split(',')[0].strip())
-            return int(current * 100 / max_val) if max_val > 0 else current
+            cache = json_loads(CACHE_FILE.read_bytes())
+            for d in cache['displays']:
+                if d['bus'] == bus:
+                    d[key] = value
+            write_cache(cache)
         except:
             pass
-    return 50
 
 
-def set_brightness(bus, percent, max_val):
-    """Set brightness (runs in background)"""
-    value = int(percent * max_val / 100)
-    subprocess.Popen(f"ddcutil --bus {bus} setvcp 10 {value}", shell=True,
-                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+probed_max = {}  # bus -> max reported by the monitor, recorded on the first brightness read
+
+
+def record_max(bus, max_val, real_max):
+    """Remember a monitor's real max, and cache it if detect's assumption was wrong"""
+    probed_max[bus] = real_max
+    if real_max != max_val:
+        update_cached_display(bus, 'max', real_max)
+
+
+def get_brightness(bus, max_val):
+    """Get current brightness as percentage, or None if the read failed"""
+    vcp = lib_getvcp(bus)
+    if vcp:
+        current, real_max = vcp
+    else:
+        output = run_cmd(ddc_cmd(bus, "getvcp", "10"), timeout=3)
+        match = CURRENT_RE.search(output)
+        if not match:
+            return None
+        current = int(match.group(1))
+        max_match = MAX_RE.search(output)
+        real_max = int(max_match.group(1)) if max_match else max_val
+    if real_max > 0:
+        record_max(bus, max_val, real_max)
+        max_val = real_max
+    return int(current * 100 / max_val) if max_val > 0 else current
+
+
+_cli_lock = Lock()
+_cli_running = set()  # buses with a ddcutil setvcp child in flight
+_cli_pending = {}  # bus -> raw value to send once that child exits
+
+
+def cli_setvcp(bus, value):
+    """Write raw brightness with the ddcutil CLI without waiting, one child per bus at a time"""
+    with _cli_lock:
+        if bus in _cli_running:
+            _cli_pending[bus] = value  # Only the latest value matters
+            return
+        spawn_setvcp(bus, value)
+
+
+def spawn_setvcp(bus, value):
+    """Spawn ddcutil setvcp, reaped by a GLib child watch (call with _cli_lock held)"""
+    # Output goes to /dev/null through fds: the DEV_NULL spawn flags can't be used from
+    # Python, the bindings always pass the stdout/stderr out-pointers GLib rejects with them
+    devnull = os.open(os.devnull, os.O_RDWR)
+    try:
+        _, pid = GLib.spawn_async_with_fds(None, ddc_cmd(bus, "setvcp", "10", str(value)), None,
+                                           GLib.SpawnFlags.SEARCH_PATH | GLib.SpawnFlags.DO_NOT_REAP_CHILD,
+                                           None, devnull, devnull, devnull)
+    except GLib.Error:
+        return  # ddcutil not installed
+    finally:
+        os.close(devnull)
+    _cli_running.add(bus)
+    GLib.child_watch_add(GLib.PRIORITY_DEFAULT, pid, on_setvcp_exit, bus)
+
+
+def on_setvcp_exit(pid, status, bus):
+    """Reap a setvcp child on the main loop, then send the value queued behind it"""
+    GLib.spawn_close_pid(pid)
+    with _cli_lock:
+        _cli_running.discard(bus)
+        if bus in _cli_pending:
+            spawn_setvcp(bus, _cli_pending.pop(bus))
+
+
+def drain_cli_writes(timeout=3):
+    """Run the main context until in-flight setvcp children have exited (app shutdown)"""
+    ctx = GLib.MainContext.default()
+    deadline = time.monotonic() + timeout
+    while _cli_running and time.monotonic() < deadline:
+        if not ctx.iteration(False):
+            time.sleep(0.01)
+
+
+def write_brightness(bus, percent, max_val):
+    """Set brightness (libddcutil once its handle is open, else a ddcutil CLI child)"""
+    value = int(percent * probed_max.get(bus, max_val) / 100)
+    if not lib_setvcp(bus, value):
+        cli_setvcp(bus, value)
+
+    # Remembered so the next launch can draw sliders without reading the monitors
+    update_cached_display(bus, 'last', percent)
+
+
+work_q = queue.Queue()
+write_pool = None  # Created with the worker by start_writer, --warm-cache never writes
+
+
+def write_quietly(bus, percent, max_val):
+    """Write brightness, a failed write must not take the worker down"""
+    try:
+        write_brightness(bus, percent, max_val)
+    except:
+        pass
+
+
+def brightness_worker():
+    """Single consumer for brightness writes, bursts collapse to the latest value per bus"""
+    while True:
+        batches = [work_q.get()]
+        try:
+            try:
+                while True:
+                    batches.append(work_q.get_nowait())
+            except queue.Empty:
+                pass
+
+            latest = {}
+            for batch in batches:
+                for bus, percent, max_val in batch:
+                    latest[bus] = (percent, max_val)
+
+            # Buses are independent, write them concurrently and wait before the next drain
+            list(write_pool.map(lambda item: write_quietly(item[0], *item[1]), latest.items()))
+        finally:
+            # do_shutdown joins the queue, every batch must be marked done
+            for _ in batches:
+                work_q.task_done()
+
+
+def start_writer():
+    """Start the write pool and the worker thread that feeds it"""
+    global write_pool
+    write_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ddc-write")
+    Thread(target=brightness_worker, daemon=True).start()
+
+
+def set_brightness(requests):
+    """Set brightness for a list of (bus, percent, max_val) (runs in background)"""
+    work_q.put(requests)
 
 
 class BrightnessWindow(Adw.ApplicationWindow):
@@ -89,10 +407,13 @@ class BrightnessWindow(Adw.ApplicationWindow):
         super().__init__(application=app, title="Brightness")
         self.displays = []
         self.sliders = []
-        self.updating = False
-        self.pending_values = {}
+        self.pending_all = None
         self.pending_timeouts = {}
+        self.last_flush = {}
+        self.last_sent = {}
         self.loading = True
+        self.max_brightness = 0
+        self.live_brightness = {}
 
         # Window setup
         self.set_default_size(350, -1)
@@ -137,25 +458,94 @@ class BrightnessWindow(Adw.ApplicationWindow):
         main_box.append(clamp)
         self.set_content(main_box)
 
-        # Detect displays and load brightness in background
-        Thread(target=self.load_displays_and_brightness, daemon=True).start()
+        # Show last-set values from the cache right away (a sysfs and /tmp read), live values follow
+        cached = cached_displays(display_fingerprint())
+        if cached and all('last' in d for d in cached):
+            self.displays = cached
+            for d in self.displays:
+                d['brightness'] = d['last']
+            self.build_sliders(max(d['brightness'] for d in self.displays))
+
+        # Detect displays and load brightness in a GTask worker thread,
+        # cancelled if the window closes mid-detect
+        self.cancellable = Gio.Cancellable()
+        self.connect("close-request", self.on_close_request)
+        task = Gio.Task.new(self, self.cancellable, self.on_loaded, None)
+        task.run_in_thread(self.load_displays_and_brightness)
+
+    def on_close_request(self, window):
+        """Stop pending background loading"""
+        self.cancellable.cancel()
+        return False
 
-    def load_displays_and_brightness(self):
+    def load_displays_and_brightness(self, task, source, data, cancellable):
         """Detect displays and load brightness values in background thread"""
-        # Detect displays
-        self.displays = detect_displays()
-
+        # Detect displays, unless the window already drew them from the cache
         if not self.displays:
-            GLib.idle_add(self.show_no_displays_error)
+            self.displays = detect_displays()
+
+        if not self.displays or cancellable.is_cancelled():
+            task.return_boolean(False)
             return
 
-        # Load brightness values
-        max_brightness = 0
-        for d in self.displays:
-            d['brightness'] = get_brightness(d['bus'], d['max'])
-            max_brightness = max(max_brightness, d['brightness'])
+        # Load brightness values in parallel, one worker per bus
+        with ThreadPoolExecutor(max_workers=len(self.displays)) as ex:
+            futures = {ex.submit(get_brightness, d['bus'], d['max']): d for d in self.displays}
+            for future in as_completed(futures):
+                self.live_brightness[futures[future]['bus']] = future.result()
+
+        self.max_brightness = max((v for v in self.live_brightness.values() if v is not None), default=50)
+        task.return_boolean(True)
 
-        GLib.idle_add(self.build_sliders, max_brightness)
+    def on_loaded(self, source, result, data):
+        """Build the UI on the main thread once loading finishes"""
+        try:
+            found = result.propagate_boolean()
+        except GLib.Error:
+            return  # Cancelled, window is gone
+        # Live values are what the monitors hold, identical writes get skipped
+        # (unless the user already moved that slider, their value wins)
+        touched = self.touched_buses()
+        for bus, value in self.live_brightness.items():
+            if value is not None and bus not in touched:
+                self.last_sent[bus] = value
+        if not found:
+            self.show_no_displays_error()
+            return
+        # Startup reads went through the CLI; libddcutil's slow first open happens off the UI path
+        Thread(target=open_handles, args=([d['bus'] for d in self.displays],), daemon=True).start()
+        if self.loading:
+            for d in self.displays:
+                live = self.live_brightness[d['bus']]
+                d['brightness'] = 50 if live is None else live
+            self.build_sliders(self.max_brightness)
+        else:
+            self.refresh_sliders(touched)
+
+    def touched_buses(self):
+        """Buses the user has set since the cached sliders were drawn"""
+        if self.pending_all is not None or 'all' in self.pending_timeouts:
+            return {d['bus'] for d in self.displays}
+        return set(self.last_sent) | set(self.pending_timeouts)
+
+    def refresh_sliders(self, touched):
+        """Move untouched sliders drawn from cache to live values that differ by more than 2%"""
+        for slider, d, handler_id in self.sliders:
+            live = self.live_brightness[d['bus']]
+            # A failed read keeps the cached value rather than a made-up one
+            if live is None or d['bus'] in touched:
+                continue
+            if abs(live - slider.get_value()) > 2:
+                self.set_quietly(slider, handler_id, live)
+        if (not touched and None not in self.live_brightness.values()
+                and abs(self.max_brightness - self.all_scale.get_value()) > 2):
+            self.set_quietly(self.all_scale, self.all_handler_id, self.max_brightness)
+
+    def set_quietly(self, scale, handler_id, value):
+        """Move a slider without emitting its value-changed handler"""
+        scale.handler_block(handler_id)
+        scale.set_value(value)
+        scale.handler_unblock(handler_id)
 
     def show_no_displays_error(self):
         """Show error when no displays found"""
@@ -168,6 +558,8 @@ class BrightnessWindow(Adw.ApplicationWindow):
 
     def build_sliders(self, max_brightness):
         """Build slider UI after loading values"""
+        if not self.loading:
+            return False  # Live values beat the cached ones here
         self.content_box.remove(self.spinner_box)
 
         # Preferences group for "All Displays"
@@ -184,7 +576,7 @@ class BrightnessWindow(Adw.ApplicationWindow):
         self.all_scale.set_valign(Gtk.Align.CENTER)
         self.all_scale.set_draw_value(True)
         self.all_scale.set_value_pos(Gtk.PositionType.LEFT)
-        self.all_scale.connect("value-changed", self.on_all_changed)
+        self.all_handler_id = self.all_scale.connect("value-changed", self.on_all_changed)
 
         all_row.add_suffix(self.all_scale)
         all_group.add(all_row)
@@ -205,40 +597,46 @@ class BrightnessWindow(Adw.ApplicationWindow):
             scale.set_valign(Gtk.Align.CENTER)
             scale.set_draw_value(True)
             scale.set_value_pos(Gtk.PositionType.LEFT)
-            scale.connect("value-changed", self.on_slider_changed, d)
+            handler_id = scale.connect("value-changed", self.on_slider_changed, d)
 
             row.add_suffix(scale)
             displays_group.add(row)
-            self.sliders.append((scale, d))
+            self.sliders.append((scale, d, handler_id))
 
         self.content_box.append(displays_group)
         self.loading = False
         return False
 
-    def debounce_apply(self, key, callback, delay_ms=300):
-        """Debounce brightness application"""
+    def debounce_apply(self, key, callback, delay_ms=300, max_interval_ms=500):
+        """Debounce brightness application, committing at most every max_interval_ms while dragging"""
         if key in self.pending_timeouts:
-            GLib.source_remove(self.pending_timeouts[key])
-        self.pending_timeouts[key] = GLib.timeout_add(delay_ms, callback)
+            GLib.source_remove(self.pending_timeouts.pop(key))
 
-    def on_all_changed(self, scale):
-        """When All slider changes, update all individual sliders visually"""
-        if self.updating:
-            return
-        self.updating = True
+        def flush():
+            self.last_flush[key] = GLib.get_monotonic_time()
+            return callback()
 
-        value = int(scale.get_value())
-        for slider, d in self.sliders:
-            slider.set_value(value)
-            self.pending_values[d['bus']] = (value, d['max'])
+        if GLib.get_monotonic_time() - self.last_flush.get(key, 0) > max_interval_ms * 1000:
+            flush()
+        else:
+            self.pending_timeouts[key] = GLib.timeout_add(delay_ms, flush)
 
-        self.updating = False
+    def on_all_changed(self, scale):
+        """When All slider changes, update all individual sliders visually"""
+        value = round(scale.get_value())
+        for slider, d, handler_id in self.sliders:
+            self.set_quietly(slider, handler_id, value)
+        self.pending_all = value
 
-        # Debounce apply to all displays
+        # Debounce apply to all displays as one batch
         def apply_all():
-            for bus, (val, max_val) in list(self.pending_values.items()):
-                set_brightness(bus, val, max_val)
-            self.pending_values.clear()
+            requests = [(d['bus'], self.pending_all, d['max']) for d in self.displays
+                        if self.last_sent.get(d['bus']) != self.pending_all]
+            if requests:
+                set_brightness(requests)
+                for bus, val, _ in requests:
+                    self.last_sent[bus] = val
+            self.pending_all = None
             if 'all' in self.pending_timeouts:
                 del self.pending_timeouts['all']
             return False
@@ -247,15 +645,14 @@ class BrightnessWindow(Adw.ApplicationWindow):
 
     def on_slider_changed(self, scale, display):
         """Apply brightness with debounce when slider changes"""
-        if self.updating:
-            return
-
-        value = int(scale.get_value())
+        value = round(scale.get_value())
         bus = display['bus']
         max_val = display['max']
 
         def apply_single():
-            set_brightness(bus, value, max_val)
+            if self.last_sent.get(bus) != value:
+                set_brightness([(bus, value, max_val)])
+                self.last_sent[bus] = value
             if bus in self.pending_timeouts:
                 del self.pending_timeouts[bus]
             return False
@@ -271,8 +668,16 @@ class BrightnessApp(Adw.Application):
 
     def do_startup(self):
         Adw.Application.do_startup(self)
+        start_writer()
         self.load_css()
 
+    def do_shutdown(self):
+        # Let queued brightness writes land before the worker thread dies
+        work_q.join()
+        drain_cli_writes()
+        close_handles()
+        Adw.Application.do_shutdown(self)
+
     def load_css(self):
         """Load ML4W theme colors"""
         css_file = Path.home() / ".config/gtk-4.0/colors.css"
@@ -292,6 +697,11 @@ class BrightnessApp(Adw.Application):
 
 
 def main():
+    # Populate the display cache without a window (run at login by a systemd user unit)
+    if "--warm-cache" in sys.argv:
+        detect_displays()
+        return
+
     app = BrightnessApp()
     app.run(None)
 
@@ -4,20 +4,51 @@ Oblivius Package Updater - Interactive TUI for selective package updates.
 Uses blessed for terminal UI.
 """
 
+import http.client
+import json
+import os
+import re
+import select
+import signal
 import subprocess
 import shutil
 import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from glob import glob
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Optional, Union
+from urllib.parse import urlencode
 
-try:
-    from blessed import Terminal
-except ImportError:
+# blessed is imported only once there is something to show in the TUI
+if not find_spec("blessed"):
     print("Error: 'blessed' library not found.")
     print("Install it with: sudo pacman -S python-blessed")
     sys.exit(1)
 
+if TYPE_CHECKING:
+    from blessed import Terminal
+
+try:
+    import pyalpm
+except ImportError:
+    pyalpm = None  # Falls back to checkupdates
+
+
+AUR_HOST = "aur.archlinux.org"
+AUR_RPC_CHUNK = 200  # Package names per info request, keeps the URI under AUR's length limit
+SYNC_DB_MAX_AGE = 30 * 60  # Re-sync pacman databases before installing if older than this (seconds)
+PACMAN_DB = "/var/lib/pacman"
+# stderr lines worth keeping from a batched install
+ERROR_LINE_RE = re.compile(r"^error:", re.IGNORECASE)
+# Private database copy refreshed by each checkupdates run, only trusted while fresh (get_official_updates)
+CHECKUPDATES_DB = os.environ.get(
+    "CHECKUPDATES_DB", os.path.join(os.environ.get("TMPDIR", "/tmp"), f"checkup-db-{os.getuid()}")
+)
+
 
 class PackageSource(Enum):
     OFFICIAL = "official"
@@ -25,7 +56,7 @@ class PackageSource(Enum):
     FLATPAK = "flatpak"
 
 
-@dataclass
+@dataclass(slots=True)
 class Package:
     name: str
     current_version: str
@@ -34,7 +65,7 @@ class Package:
     selected: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class UpdateResult:
     name: str
     source: PackageSource
@@ -42,6 +73,151 @@ class UpdateResult:
     error: str = ""
 
 
+def run_fast(argv: list[str], timeout: float = 60) -> tuple[int, bytes]:
+    """Run a command via posix_spawn (no fork of this process), returning (returncode, stdout)."""
+    read_fd, write_fd = os.pipe()
+    try:
+        pid = os.posix_spawnp(argv[0], argv, os.environ, file_actions=[
+            (os.POSIX_SPAWN_DUP2, write_fd, 1),
+            (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+        ])
+    except OSError:
+        os.close(read_fd)
+        raise
+    finally:
+        os.close(write_fd)
+
+    chunks = []
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                raise subprocess.TimeoutExpired(argv, timeout)
+            ready, _, _ = select.select([read_fd], [], [], remaining)
+            if ready:
+                chunk = os.read(read_fd, 65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    finally:
+        os.close(read_fd)
+
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status), b"".join(chunks)
+
+
+def run_streaming(argv: list[str], keep: Optional[re.Pattern] = None) -> tuple[int, list[str], list[str]]:
+    """Run a command with stderr shown live, returning (returncode, last stderr lines, stderr lines matching keep)."""
+    tail: deque[str] = deque(maxlen=5)
+    kept: deque[str] = deque(maxlen=200)
+
+    def take(raw: bytes):
+        line = raw.decode(errors="replace").strip()
+        if line:
+            tail.append(line)
+            if keep and keep.search(line):
+                kept.append(line)
+
+    with subprocess.Popen(argv, stderr=subprocess.PIPE, bufsize=0) as proc:
+        fd = proc.stderr.fileno()
+        os.set_blocking(fd, False)
+        partial = b""
+        while True:
+            ready, _, _ = select.select([fd], [], [], 0.1)
+            if not ready:
+                # Daemons started by a build (e.g. gpg-agent) can hold the pipe open after we're done
+                if proc.poll() is not None:
+                    break
+                continue
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                continue
+            if not chunk:
+                break
+            sys.stderr.buffer.write(chunk)
+            sys.stderr.buffer.flush()
+            *lines, partial = (partial + chunk).split(b"\n")
+            for raw in lines:
+                take(raw)
+        take(partial)
+    return proc.returncode, list(tail), list(kept)
+
+
+def last_error_line(stderr: Optional[str]) -> str:
+    """Last non-empty stderr line, used as the failure reason."""
+    error_lines = [l.strip() for l in (stderr or "").split("\n") if l.strip()]
+    return error_lines[-1] if error_lines else "Unknown error"
+
+
+def failed_targets(stderr: Optional[str], names: list[str]) -> dict[str, str]:
+    """Map package names to the last stderr error line that names them exactly."""
+    errors = [l.strip() for l in (stderr or "").split("\n") if l.strip().lower().startswith("error:")]
+    failed = {}
+    for name in names:
+        # Allow a trailing "-<version>" but not a longer package name
+        pattern = re.compile(r"(?<![\w.+@-])" + re.escape(name) + r"(?![\w.+@]|-(?!r?\d))")
+        for line in errors:
+            if pattern.search(line):
+                failed[name] = line
+    return failed
+
+
+def installed_versions(pkgs: list[Package]) -> dict[str, str]:
+    """Currently installed version of each package, by name (missing if not installed)."""
+    versions = {}
+    pacman_names = [p.name for p in pkgs if p.source is not PackageSource.FLATPAK]
+    try:
+        if pacman_names:
+            # Nonzero if any name isn't installed, the others are still listed
+            _, stdout = run_fast(["pacman", "-Q", *pacman_names])
+            for line in stdout.splitlines():
+                parts = line.split()
+                if len(parts) == 2:
+                    versions[parts[0].decode()] = parts[1].decode()
+        if len(pacman_names) < len(pkgs):
+            _, stdout = run_fast(["flatpak", "list", "--columns=application,version"])
+            for line in stdout.splitlines():
+                parts = line.split(b"\t")
+                versions[parts[0].strip().decode()] = parts[1].strip().decode() if len(parts) > 1 else ""
+    except (subprocess.TimeoutExpired, OSError):
+        pass
+    return versions
+
+
+def reached_version(pkg: Package, installed: Optional[str]) -> bool:
+    """Whether an installed version shows pkg was updated."""
+    if installed is None:
+        return False
+    if pkg.new_version in ("?", ""):
+        # Target unknown: a changed pacman version counts, flatpaks can't be confirmed
+        return pkg.source is not PackageSource.FLATPAK and installed != pkg.current_version
+    if pyalpm and pkg.source is not PackageSource.FLATPAK:
+        return pyalpm.vercmp(installed, pkg.new_version) >= 0
+    return installed == pkg.new_version
+
+
+def sync_db_age(dbpath: str = PACMAN_DB) -> float:
+    """Seconds since the pacman sync databases were last refreshed."""
+    mtimes = [os.stat(db).st_mtime for db in glob(os.path.join(dbpath, "sync", "*.db"))]
+    return time.time() - max(mtimes) if mtimes else float("inf")
+
+
+def pacman_repos() -> list[str]:
+    """Repository names configured in pacman.conf (and its includes), in priority order."""
+    try:
+        returncode, stdout = run_fast(["pacman-conf", "--repo-list"], timeout=10)
+    except subprocess.TimeoutExpired as e:
+        raise OSError(e) from e
+    if returncode != 0:
+        # No repos would make every package look foreign or up to date, let callers fall back
+        raise OSError(f"pacman-conf exited with {returncode}")
+    return [line.decode() for line in stdout.split() if line]
+
+
 def detect_aur_helper() -> Optional[str]:
     """Detect available AUR helper (paru or yay)."""
     for helper in ["paru", "yay"]:
@@ -51,22 +227,43 @@ def detect_aur_helper() -> Optional[str]:
 
 
 def get_official_updates() -> list[Package]:
+    """Get list of official repository updates, in-process via pyalpm when possible."""
+    if pyalpm:
+        # Newest of checkupdates' copy and the system databases, if recent enough to trust
+        dbpath = min((CHECKUPDATES_DB, PACMAN_DB), key=sync_db_age)
+        if sync_db_age(dbpath) <= SYNC_DB_MAX_AGE:
+            try:
+                return get_alpm_updates(dbpath)
+            except (pyalpm.error, OSError):
+                pass
+    return get_checkupdates_updates()
+
+
+def get_alpm_updates(dbpath: str) -> list[Package]:
+    """Compare local packages against the sync databases at dbpath with pyalpm."""
+    handle = pyalpm.Handle("/", dbpath)
+    syncdbs = [handle.register_syncdb(repo, 0) for repo in pacman_repos()]
+    packages = []
+    for pkg in handle.get_localdb().pkgcache:
+        newer = pyalpm.sync_newversion(pkg, syncdbs)
+        if newer:
+            packages.append(Package(pkg.name, pkg.version, newer.version, PackageSource.OFFICIAL))
+    return packages
+
+
+def get_checkupdates_updates() -> list[Package]:
     """Get list of official repository updates using checkupdates."""
     packages = []
     try:
-        result = subprocess.run(
-            ["checkupdates"],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            for line in result.stdout.strip().split("\n"):
-                parts = line.split()
+        returncode, stdout = run_fast(["checkupdates"])
+        if returncode == 0:
+            # Parse bytes and decode only the fields kept ("name old -> new")
+            for line in stdout.splitlines():
+                parts = line.split(None, 4)
                 if len(parts) >= 4:
-                    name = parts[0]
-                    current = parts[1]
-                    new = parts[3]
+                    name = parts[0].decode()
+                    current = parts[1].decode()
+                    new = parts[3].decode()
                     packages.append(Package(name, current, new, PackageSource.OFFICIAL))
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
@@ -74,26 +271,65 @@ def get_official_updates() -> list[Package]:
 
 
 def get_aur_updates(helper: str) -> list[Package]:
+    """Get list of AUR updates, from the AUR RPC when possible, else via yay or paru."""
+    if pyalpm:
+        try:
+            return get_rpc_aur_updates()
+        except (pyalpm.error, OSError, http.client.HTTPException, ValueError, KeyError, TypeError):
+            pass
+    return get_helper_aur_updates(helper)
+
+
+def get_rpc_aur_updates() -> list[Package]:
+    """Look up foreign packages with batched AUR RPC info requests over one connection."""
+    handle = pyalpm.Handle("/", PACMAN_DB)
+    syncdbs = [handle.register_syncdb(repo, 0) for repo in pacman_repos()]
+    foreign = {
+        pkg.name: pkg.version for pkg in handle.get_localdb().pkgcache
+        if not any(db.get_pkg(pkg.name) for db in syncdbs)
+    }
+    names = list(foreign)
+    packages = []
+    conn = http.client.HTTPSConnection(AUR_HOST, timeout=15)
+    try:
+        for i in range(0, len(names), AUR_RPC_CHUNK):
+            query = urlencode([("arg[]", name) for name in names[i:i + AUR_RPC_CHUNK]])
+            conn.request("GET", f"/rpc/v5/info?{query}")
+            resp = conn.getresponse()
+            body = resp.read()
+            if resp.status != 200:
+                raise http.client.HTTPException(f"AUR RPC returned {resp.status}")
+            reply = json.loads(body)
+            if not isinstance(reply, dict) or reply.get("type") == "error":
+                raise ValueError(reply.get("error") if isinstance(reply, dict) else "malformed AUR RPC reply")
+            results = reply.get("results")
+            if not isinstance(results, list) or not all(isinstance(info, dict) for info in results):
+                raise ValueError("malformed AUR RPC results")
+            for info in results:
+                current = foreign.get(info["Name"])
+                if current and pyalpm.vercmp(current, info["Version"]) < 0:
+                    packages.append(Package(info["Name"], current, info["Version"], PackageSource.AUR))
+    finally:
+        conn.close()
+    return packages
+
+
+def get_helper_aur_updates(helper: str) -> list[Package]:
     """Get list of AUR updates using yay or paru."""
     packages = []
     try:
-        result = subprocess.run(
-            [helper, "-Qum"],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            for line in result.stdout.strip().split("\n"):
-                parts = line.split()
+        returncode, stdout = run_fast([helper, "-Qum"])
+        if returncode == 0:
+            for line in stdout.splitlines():
+                parts = line.split(None, 4)
                 if len(parts) >= 4:
-                    name = parts[0]
-                    current = parts[1]
-                    new = parts[3]
+                    name = parts[0].decode()
+                    current = parts[1].decode()
+                    new = parts[3].decode()
                     packages.append(Package(name, current, new, PackageSource.AUR))
                 elif len(parts) >= 2:
-                    name = parts[0]
-                    current = parts[1] if len(parts) > 1 else "?"
+                    name = parts[0].decode()
+                    current = parts[1].decode()
                     packages.append(Package(name, current, "?", PackageSource.AUR))
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
@@ -106,20 +342,14 @@ def get_flatpak_updates() -> list[Package]:
     if not shutil.which("flatpak"):
         return packages
     try:
-        result = subprocess.run(
-            ["flatpak", "remote-ls", "--updates", "--columns=application,version"],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            for line in result.stdout.strip().split("\n"):
-                parts = line.split("\t")
-                if parts:
-                    name = parts[0].strip()
-                    new_version = parts[1].strip() if len(parts) > 1 else "?"
-                    if name:
-                        packages.append(Package(name, "installed", new_version, PackageSource.FLATPAK))
+        returncode, stdout = run_fast(["flatpak", "remote-ls", "--updates", "--columns=application,version"])
+        if returncode == 0:
+            for line in stdout.splitlines():
+                parts = line.split(b"\t")
+                name = parts[0].strip()
+                if name:
+                    new_version = parts[1].strip().decode() if len(parts) > 1 else "?"
+                    packages.append(Package(name.decode(), "installed", new_version, PackageSource.FLATPAK))
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
     return packages
@@ -131,21 +361,63 @@ class UpdaterTUI:
     CONFIRM_BUTTONS = ["Yes, Update", "Go Back"]
     RESULTS_BUTTONS = ["Exit"]
 
-    def __init__(self, term: Terminal, packages: list[Package], aur_helper: Optional[str]):
+    def __init__(self, term: "Terminal", packages: list[Package], aur_helper: Optional[str],
+                 sequential: bool = False):
         self.term = term
         self.packages = packages
         self.aur_helper = aur_helper
+        self.sequential = sequential  # One transaction per package (debugging)
         self.cursor = 0
         self.scroll_offset = 0
         self.mode = "select"  # select, confirm, updating, results
         self.in_button_area = False
         self.button_cursor = 0
         self.results: list[UpdateResult] = []
+        self._selected_count = sum(1 for p in packages if p.selected)
+        # Selection snapshot taken on entering confirm mode (None while selecting)
+        self._confirm_selected: Optional[list[Package]] = None
+        self._by_source: Optional[dict[PackageSource, list[Package]]] = None
+        self._buf: list[bytes] = []  # Lines of the frame being drawn
+        self._last_lines: list[bytes] = []  # Lines currently on screen
+        self._drawn_mode: Optional[str] = None
+        self._full_redraw = True
+        self._dirty = True  # Visible state changed since the last frame
+        # Terminal size snapshot for the frame being drawn (None until drawn / after resize)
+        self._w = self._h = 0
+        self._vh: Optional[int] = None
+        # Centered scroll indicator, rebuilt only when its inputs change
+        self._scroll_str = ""
+        self._last_scroll_key: Optional[tuple[int, int, int, int]] = None
+
+        # Formatted once, not per row per frame
+        self._src_label = {
+            PackageSource.OFFICIAL: term.green("repo"),
+            PackageSource.AUR: term.yellow("AUR"),
+            PackageSource.FLATPAK: term.blue("flat"),
+        }
+        self._src_label_b = {src: label.encode() for src, label in self._src_label.items()}
+        self._src_label_plain = {
+            PackageSource.OFFICIAL: "repo",
+            PackageSource.AUR: "AUR",
+            PackageSource.FLATPAK: "flat",
+        }
+        self._ok = term.green("✓")
+        self._bad = term.red("✗")
+        self._home_clear_b = (term.home + term.clear).encode()
+        self._clear_eol_b = term.clear_eol.encode()
 
     @property
     def visible_height(self) -> int:
+        if self._vh is not None:
+            return self._vh
         return self.term.height - 10  # Reserve lines for header/footer/buttons
 
+    def on_resize(self, signum, frame):
+        """SIGWINCH: drop the cached size and repaint everything next frame."""
+        self._vh = None
+        self._full_redraw = True
+        self._dirty = True
+
     @property
     def current_buttons(self) -> list[str]:
         if self.mode == "select":
@@ -156,13 +428,28 @@ class UpdaterTUI:
             return self.RESULTS_BUTTONS
         return []
 
+    def emit(self, line: Union[str, bytes] = b""):
+        """Queue a line of the current frame."""
+        self._buf.append(line if isinstance(line, bytes) else line.encode())
+
+    def _center(self, s: str, visible_len: Optional[int] = None) -> str:
+        """Center s in the frame width; a known visible_len skips measuring ANSI sequences."""
+        if visible_len is None:
+            visible_len = self.term.length(s)
+        return " " * max(0, (self._w - visible_len) // 2) + s
+
     def draw(self):
-        print(self.term.home + self.term.clear, end="")
+        self._dirty = False
+
+        # Read the terminal size once per frame (each read is an ioctl)
+        self._w = self.term.width
+        self._h = self.term.height
+        self._vh = self._h - 10  # Reserve lines for header/footer/buttons
 
         # Header
         title = "OBLIVIUS PACKAGE UPDATER"
-        print(self.term.center(self.term.bold_cyan(title)))
-        print(self.term.center("─" * 40))
+        self.emit(self.term.center(self.term.bold_cyan(title)))
+        self.emit(self.term.center("─" * 40))
 
         if self.mode == "select":
             self.draw_select_mode()
@@ -173,99 +460,122 @@ class UpdaterTUI:
         elif self.mode == "results":
             self.draw_results_mode()
 
+        # Clear the screen only on mode changes, otherwise rewrite just the rows that changed
+        if self.mode != self._drawn_mode:
+            self._drawn_mode = self.mode
+            self._full_redraw = True
+        out = bytearray()
+        if self._full_redraw:
+            out += self._home_clear_b
+            self._last_lines = []
+            self._full_redraw = False
+
+        lines, last = self._buf, self._last_lines
+        clear_eol = self._clear_eol_b
+        for row, line in enumerate(lines):
+            if row >= len(last) or last[row] != line:
+                out += self.term.move_xy(0, row).encode()
+                out += line
+                out += clear_eol
+        for row in range(len(lines), len(last)):
+            out += self.term.move_xy(0, row).encode()
+            out += clear_eol
+
+        # One write per frame, straight to the byte buffer (text written by blessed is flushed first)
+        sys.stdout.flush()
+        sys.stdout.buffer.write(out)
+        sys.stdout.buffer.flush()
+        self._last_lines = lines
+        self._buf = []
+
     def draw_select_mode(self):
-        selected_count = sum(1 for p in self.packages if p.selected)
         total_count = len(self.packages)
 
         # Status line
-        status = f"Selected: {selected_count}/{total_count}"
-        print(self.term.center(status))
-        print()
+        status = f"Selected: {self._selected_count}/{total_count}"
+        self.emit(self.term.center(status))
+        self.emit()
 
         # Package list
-        visible_packages = self.packages[self.scroll_offset:self.scroll_offset + self.visible_height]
+        visible_packages = self.packages[self.scroll_offset:self.scroll_offset + self._vh]
+        max_name_len = self._w - 25
 
         for i, pkg in enumerate(visible_packages):
             actual_idx = i + self.scroll_offset
             is_cursor = (actual_idx == self.cursor) and not self.in_button_area
 
             # Arrow indicator instead of highlight
-            arrow = ">" if is_cursor else " "
-            checkbox = "[x]" if pkg.selected else "[ ]"
-
-            source_label = {
-                PackageSource.OFFICIAL: self.term.green("repo"),
-                PackageSource.AUR: self.term.yellow("AUR"),
-                PackageSource.FLATPAK: self.term.blue("flat"),
-            }[pkg.source]
-
-            # Truncate package name if needed
-            max_name_len = self.term.width - 25
-            name = pkg.name[:max_name_len] if len(pkg.name) > max_name_len else pkg.name
+            line = bytearray(b" > " if is_cursor else b"   ")
+            line += b"[x] " if pkg.selected else b"[ ] "
+            line += self._src_label_b[pkg.source]
+            line += b" "
 
-            line = f" {arrow} {checkbox} {source_label} {name}"
-            print(line)
+            # Truncate package name if needed (common case keeps the original string)
+            name = pkg.name if len(pkg.name) <= max_name_len else pkg.name[:max_name_len]
+            line += name.encode()
+            self.emit(bytes(line))
 
         # Padding
-        for _ in range(self.visible_height - len(visible_packages)):
-            print()
-
-        # Scroll indicator
-        if len(self.packages) > self.visible_height:
-            scroll_pct = (self.scroll_offset / max(1, len(self.packages) - self.visible_height)) * 100
-            print(self.term.center(f"─── {scroll_pct:.0f}% ───"))
-        else:
-            print(self.term.center("─" * 20))
+        for _ in range(self._vh - len(visible_packages)):
+            self.emit()
+
+        # Scroll indicator (width is part of the key since it's centered)
+        scroll_key = (self.scroll_offset, total_count, self._vh, self._w)
+        if scroll_key != self._last_scroll_key:
+            self._last_scroll_key = scroll_key
+            if total_count > self._vh:
+                scroll_pct = (self.scroll_offset / max(1, total_count - self._vh)) * 100
+                self._scroll_str = self._center(f"─── {scroll_pct:.0f}% ───")
+            else:
+                self._scroll_str = self._center("─" * 20)
+        self.emit(self._scroll_str)
 
-        print()
+        self.emit()
         self.draw_buttons()
 
     def draw_confirm_mode(self):
-        selected = [p for p in self.packages if p.selected]
-        print()
-        print(self.term.center(f"Update {len(selected)} package(s)?"))
-        print()
+        selected = self._confirm_selected
+        self.emit()
+        self.emit(self.term.center(f"Update {len(selected)} package(s)?"))
+        self.emit()
 
         # Show selected packages
-        display_count = min(self.visible_height, len(selected))
+        display_count = min(self._vh, len(selected))
         for pkg in selected[:display_count]:
-            source_label = {
-                PackageSource.OFFICIAL: self.term.green("repo"),
-                PackageSource.AUR: self.term.yellow("AUR"),
-                PackageSource.FLATPAK: self.term.blue("flat"),
-            }[pkg.source]
-            print(self.term.center(f"{source_label} {pkg.name}"))
+            source_label = self._src_label[pkg.source]
+            visible_len = len(self._src_label_plain[pkg.source]) + 1 + len(pkg.name)
+            self.emit(self._center(f"{source_label} {pkg.name}", visible_len))
 
         if len(selected) > display_count:
-            print(self.term.center(f"... and {len(selected) - display_count} more"))
+            self.emit(self.term.center(f"... and {len(selected) - display_count} more"))
 
         # Padding to push buttons to bottom
         used_lines = min(display_count, len(selected)) + (1 if len(selected) > display_count else 0) + 3
-        for _ in range(self.visible_height - used_lines):
-            print()
+        for _ in range(self._vh - used_lines):
+            self.emit()
 
-        print()
+        self.emit()
         self.draw_buttons()
 
     def draw_updating_mode(self):
-        print()
-        print(self.term.center("Updating packages..."))
-        print()
-        print(self.term.center("Please wait..."))
+        self.emit()
+        self.emit(self.term.center("Updating packages..."))
+        self.emit()
+        self.emit(self.term.center("Please wait..."))
 
     def draw_results_mode(self):
         successes = [r for r in self.results if r.success]
         failures = [r for r in self.results if not r.success]
 
-        print()
+        self.emit()
         if failures:
-            print(self.term.center(self.term.yellow(f"{len(successes)} succeeded, {len(failures)} failed")))
+            self.emit(self.term.center(self.term.yellow(f"{len(successes)} succeeded, {len(failures)} failed")))
         else:
-            print(self.term.center(self.term.green(f"All {len(successes)} packages updated!")))
-        print()
+            self.emit(self.term.center(self.term.green(f"All {len(successes)} packages updated!")))
+        self.emit()
 
         # Calculate available height for results
-        available_height = self.visible_height
+        available_height = self._vh
 
         # Show results
         results_shown = 0
@@ -274,36 +584,29 @@ class UpdaterTUI:
         for r in successes:
             if results_shown >= available_height:
                 break
-            source_label = {
-                PackageSource.OFFICIAL: "repo",
-                PackageSource.AUR: "AUR",
-                PackageSource.FLATPAK: "flat",
-            }[r.source]
-            line = f" {self.term.green('✓')} [{source_label}] {r.name}"
-            print(line)
+            source_label = self._src_label_plain[r.source]
+            line = f" {self._ok} [{source_label}] {r.name}"
+            self.emit(line)
             results_shown += 1
 
         # Show failures
+        err_room = self._w - 20
         for r in failures:
             if results_shown >= available_height:
                 break
-            source_label = {
-                PackageSource.OFFICIAL: "repo",
-                PackageSource.AUR: "AUR",
-                PackageSource.FLATPAK: "flat",
-            }[r.source]
+            source_label = self._src_label_plain[r.source]
             # Truncate error to fit
-            max_err_len = self.term.width - len(r.name) - 20
-            error = r.error[:max_err_len] if len(r.error) > max_err_len else r.error
-            line = f" {self.term.red('✗')} [{source_label}] {r.name}: {error}"
-            print(line)
+            max_err_len = err_room - len(r.name)
+            error = r.error if len(r.error) <= max_err_len else r.error[:max_err_len]
+            line = f" {self._bad} [{source_label}] {r.name}: {error}"
+            self.emit(line)
             results_shown += 1
 
         # Padding
         for _ in range(available_height - results_shown):
-            print()
+            self.emit()
 
-        print()
+        self.emit()
         self.draw_buttons()
 
     def draw_buttons(self):
@@ -316,9 +619,10 @@ class UpdaterTUI:
             else:
                 button_strs.append(f"[{btn}]")
 
-        print(self.term.center("  ".join(button_strs)))
+        self.emit(self.term.center("  ".join(button_strs)))
 
     def move_cursor(self, delta: int):
+        before = (self.button_cursor, self.cursor, self.scroll_offset)
         if self.in_button_area:
             self.button_cursor = max(0, min(len(self.current_buttons) - 1, self.button_cursor + delta))
         else:
@@ -328,25 +632,44 @@ class UpdaterTUI:
                 self.scroll_offset = self.cursor
             elif self.cursor >= self.scroll_offset + self.visible_height:
                 self.scroll_offset = self.cursor - self.visible_height + 1
+        # No redraw when already at an edge
+        if (self.button_cursor, self.cursor, self.scroll_offset) != before:
+            self._dirty = True
+
+    def jump_to(self, cursor: int, scroll_offset: int):
+        """Move the list cursor and scroll position directly (Home/End)."""
+        if (cursor, scroll_offset) != (self.cursor, self.scroll_offset):
+            self.cursor = cursor
+            self.scroll_offset = scroll_offset
+            self._dirty = True
 
     def move_to_buttons(self):
         self.in_button_area = True
         self.button_cursor = 0
+        self._dirty = True
 
     def move_to_list(self):
         self.in_button_area = False
+        self._dirty = True
 
     def toggle_current(self):
         if not self.in_button_area and self.packages:
-            self.packages[self.cursor].selected = not self.packages[self.cursor].selected
+            pkg = self.packages[self.cursor]
+            pkg.selected = not pkg.selected
+            self._selected_count += 1 if pkg.selected else -1
+            self._dirty = True
 
     def select_all(self):
         for pkg in self.packages:
             pkg.selected = True
+        self._selected_count = len(self.packages)
+        self._dirty = True
 
     def deselect_all(self):
         for pkg in self.packages:
             pkg.selected = False
+        self._selected_count = 0
+        self._dirty = True
 
     def activate_button(self):
         """Handle button activation based on current mode."""
@@ -359,10 +682,16 @@ class UpdaterTUI:
                 self.deselect_all()
                 self.move_to_list()
             elif btn == "Update":
-                if any(p.selected for p in self.packages):
+                if self._selected_count:
+                    self._confirm_selected = [p for p in self.packages if p.selected]
+                    self._by_source = {
+                        src: [p for p in self._confirm_selected if p.source is src]
+                        for src in PackageSource
+                    }
                     self.mode = "confirm"
                     self.in_button_area = True
                     self.button_cursor = 0
+                    self._dirty = True
             elif btn == "Exit":
                 return "exit"
 
@@ -371,8 +700,10 @@ class UpdaterTUI:
             if btn == "Yes, Update":
                 return "run_updates"
             elif btn == "Go Back":
+                self._confirm_selected = self._by_source = None
                 self.mode = "select"
                 self.in_button_area = False
+                self._dirty = True
 
         elif self.mode == "results":
             return "exit"
@@ -384,18 +715,16 @@ class UpdaterTUI:
         self.mode = "updating"
         self.draw()
 
-        selected = [p for p in self.packages if p.selected]
-
-        # Group by source
-        official = [p for p in selected if p.source == PackageSource.OFFICIAL]
-        aur = [p for p in selected if p.source == PackageSource.AUR]
-        flatpaks = [p for p in selected if p.source == PackageSource.FLATPAK]
+        # Grouped by source when the selection was confirmed
+        official = self._by_source[PackageSource.OFFICIAL]
+        aur = self._by_source[PackageSource.AUR]
+        flatpaks = self._by_source[PackageSource.FLATPAK]
 
         self.results = []
 
         # Exit fullscreen for actual updates
-        print(self.term.exit_fullscreen, end="")
-        print(self.term.normal, end="")
+        sys.stdout.buffer.write((self.term.exit_fullscreen + self.term.normal).encode())
+        sys.stdout.buffer.flush()
         print("\n" + "=" * 60)
         print("Starting package updates...")
         print("=" * 60 + "\n")
@@ -403,68 +732,84 @@ class UpdaterTUI:
         # Update official + AUR packages
         pacman_pkgs = official + aur
         if pacman_pkgs and self.aur_helper:
-            # Sync database first
-            print("\n[Syncing package database...]\n")
-            subprocess.run([self.aur_helper, "-Sy"], capture_output=True)
-
-            # Update each package
-            total = len(pacman_pkgs)
-            for i, pkg in enumerate(pacman_pkgs, 1):
-                source_label = "repo" if pkg.source == PackageSource.OFFICIAL else "AUR"
-                print(f"\n[{i}/{total}] Updating {pkg.name} ({source_label})...\n")
-                result = subprocess.run(
-                    [self.aur_helper, "-S", "--needed", "--noconfirm", pkg.name],
-                    capture_output=False,
-                    text=True,
-                    stderr=subprocess.PIPE
-                )
-                if result.returncode != 0:
-                    error_lines = [l.strip() for l in (result.stderr or "").split("\n") if l.strip()]
-                    last_error = error_lines[-1] if error_lines else "Unknown error"
-                    self.results.append(UpdateResult(pkg.name, pkg.source, False, last_error))
-                    print(f"  FAILED: {last_error}")
-                else:
-                    self.results.append(UpdateResult(pkg.name, pkg.source, True))
+            # checkupdates already fetched fresh databases, only sync if ours are stale
+            if sync_db_age() > SYNC_DB_MAX_AGE:
+                print("\n[Syncing package database...]\n")
+                subprocess.run([self.aur_helper, "-Sy"])
+
+            self.install_packages([self.aur_helper, "-S", "--needed", "--noconfirm"], pacman_pkgs)
 
         # Update flatpaks
         if flatpaks:
-            total = len(flatpaks)
-            for i, pkg in enumerate(flatpaks, 1):
-                print(f"\n[{i}/{total}] Updating {pkg.name} (flatpak)...\n")
-                result = subprocess.run(
-                    ["flatpak", "update", "-y", pkg.name],
-                    capture_output=False,
-                    text=True,
-                    stderr=subprocess.PIPE
-                )
-                if result.returncode != 0:
-                    error_lines = [l.strip() for l in (result.stderr or "").split("\n") if l.strip()]
-                    last_error = error_lines[-1] if error_lines else "Unknown error"
-                    self.results.append(UpdateResult(pkg.name, pkg.source, False, last_error))
-                    print(f"  FAILED: {last_error}")
-                else:
-                    self.results.append(UpdateResult(pkg.name, pkg.source, True))
+            self.install_packages(["flatpak", "update", "-y"], flatpaks)
 
         print("\n" + "=" * 60)
-        print("Updates complete! Returning to results view...")
+        print("Updates complete!")
         print("=" * 60)
 
         # Signal waybar to refresh
         subprocess.run(["pkill", "-RTMIN+1", "waybar"], capture_output=True)
 
-        # Brief pause then show results
-        import time
-        time.sleep(1)
+        # On failure, leave the build output up until the user has read it
+        if any(not r.success for r in self.results):
+            # Still in cbreak mode (no echo, no line editing), so wait for the key itself
+            print("\nPress Enter to view results...", flush=True)
+            while self.term.inkey().name != "KEY_ENTER":
+                pass
 
         # Return to TUI for results
         self.mode = "results"
         self.in_button_area = True
         self.button_cursor = 0
+        self._dirty = True
+
+    def install_packages(self, base_cmd: list[str], pkgs: list[Package]):
+        """Install packages in a single transaction, recording a result per package."""
+        labels = {PackageSource.OFFICIAL: "repo", PackageSource.AUR: "AUR", PackageSource.FLATPAK: "flatpak"}
+
+        if self.sequential:
+            total = len(pkgs)
+            for i, pkg in enumerate(pkgs, 1):
+                print(f"\n[{i}/{total}] Updating {pkg.name} ({labels[pkg.source]})...\n")
+                returncode, tail, _ = run_streaming(base_cmd + [pkg.name])
+                if returncode != 0:
+                    last_error = last_error_line("\n".join(tail))
+                    self.results.append(UpdateResult(pkg.name, pkg.source, False, last_error))
+                    print(f"  FAILED: {last_error}")
+                else:
+                    self.results.append(UpdateResult(pkg.name, pkg.source, True))
+            return
+
+        print(f"\n[Updating {len(pkgs)} package(s) in one transaction...]\n")
+        names = [p.name for p in pkgs]
+        # Error lines can scroll out of the tail during long builds, keep them separately
+        returncode, tail, kept = run_streaming(base_cmd + names, keep=ERROR_LINE_RE)
+
+        failed = {}
+        if returncode != 0:
+            # A helper call isn't one transaction: paru/yay install repo targets before building
+            # AUR ones and flatpak updates refs one by one, so check what actually got installed
+            errors = failed_targets("\n".join(kept or tail), names)
+            installed = installed_versions(pkgs)
+            failed = {
+                p.name: errors.get(p.name, "Not updated (see output above)")
+                for p in pkgs if not reached_version(p, installed.get(p.name))
+            }
+
+        for pkg in pkgs:
+            if pkg.name in failed:
+                self.results.append(UpdateResult(pkg.name, pkg.source, False, failed[pkg.name]))
+                print(f"  FAILED: {pkg.name} ({labels[pkg.source]}): {failed[pkg.name]}")
+            else:
+                self.results.append(UpdateResult(pkg.name, pkg.source, True))
 
     def run(self):
+        signal.signal(signal.SIGWINCH, self.on_resize)
         with self.term.fullscreen(), self.term.cbreak(), self.term.hidden_cursor():
             while True:
-                self.draw()
+                # Keys that change nothing visible (e.g. Right on the last button) skip the frame
+                if self._dirty:
+                    self.draw()
                 key = self.term.inkey(timeout=None)
 
                 # Handle navigation (works in select, confirm, results modes)
@@ -472,8 +817,7 @@ class UpdaterTUI:
                     if key.name == "KEY_UP" or key.lower() in ("w", "k"):
                         if self.in_button_area and self.mode == "select":
                             self.move_to_list()
-                            self.cursor = len(self.packages) - 1
-                            self.scroll_offset = max(0, len(self.packages) - self.visible_height)
+                            self.jump_to(len(self.packages) - 1, max(0, len(self.packages) - self.visible_height))
                         else:
                             self.move_cursor(-1)
                     elif key.name == "KEY_DOWN" or key.lower() in ("s", "j"):
@@ -498,12 +842,10 @@ class UpdaterTUI:
                             self.move_cursor(self.visible_height)
                     elif key.name == "KEY_HOME":
                         if not self.in_button_area:
-                            self.cursor = 0
-                            self.scroll_offset = 0
+                            self.jump_to(0, 0)
                     elif key.name == "KEY_END":
                         if not self.in_button_area:
-                            self.cursor = len(self.packages) - 1
-                            self.scroll_offset = max(0, len(self.packages) - self.visible_height)
+                            self.jump_to(len(self.packages) - 1, max(0, len(self.packages) - self.visible_height))
                     elif key == " ":
                         if self.mode == "select":
                             if self.in_button_area:
@@ -527,47 +869,56 @@ class UpdaterTUI:
                         break
 
 
-def main():
-    term = Terminal()
+def center(s: str) -> str:
+    """Center s in the terminal width, for plain output before the TUI starts."""
+    try:
+        width = os.get_terminal_size().columns
+    except OSError:
+        width = 80
+    return s.center(width).rstrip()
 
-    print(term.clear + term.home)
-    print(term.center(term.bold("Oblivius Package Updater")))
+
+def main():
     print()
-    print(term.center("Checking for updates..."))
+    print(center("Oblivius Package Updater"))
+    print()
+    print(center("Checking for updates..."))
 
     # Detect AUR helper
     aur_helper = detect_aur_helper()
     if not aur_helper:
-        print(term.center(term.red("Warning: No AUR helper found (yay/paru)")))
+        print(center("Warning: No AUR helper found (yay/paru)"))
 
-    # Gather packages
+    # Gather packages, probing all sources concurrently (each is I/O-bound)
     packages: list[Package] = []
 
-    print(term.center("  Checking official repos..."))
-    packages.extend(get_official_updates())
-
-    if aur_helper:
-        print(term.center("  Checking AUR..."))
-        packages.extend(get_aur_updates(aur_helper))
-
-    print(term.center("  Checking Flatpak..."))
-    packages.extend(get_flatpak_updates())
+    sources = ["official repos", "AUR", "Flatpak"] if aur_helper else ["official repos", "Flatpak"]
+    print(center(f"  Checking {', '.join(sources)}..."))
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(get_official_updates)]
+        if aur_helper:
+            futures.append(pool.submit(get_aur_updates, aur_helper))
+        futures.append(pool.submit(get_flatpak_updates))
+        for future in futures:
+            packages.extend(future.result())
 
     if not packages:
         print()
-        print(term.center(term.green("No updates available!")))
+        print(center("No updates available!"))
         print()
-        print(term.center("Press Enter to exit..."))
+        print(center("Press Enter to exit..."))
         input()
         # Signal waybar to refresh
         subprocess.run(["pkill", "-RTMIN+1", "waybar"], capture_output=True)
         return
 
-    print(term.center(f"  Found {len(packages)} updates."))
+    print(center(f"  Found {len(packages)} updates."))
     print()
 
     # Run TUI
-    tui = UpdaterTUI(term, packages, aur_helper)
+    from blessed import Terminal
+    term = Terminal()
+    tui = UpdaterTUI(term, packages, aur_helper, sequential="--sequential" in sys.argv)
     tui.run()
 
 